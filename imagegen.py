@@ -8,74 +8,262 @@ real generator without changing the app code.
 
 from __future__ import annotations
 
-from datetime import datetime
+import hashlib
+import itertools
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from random import randint
-from textwrap import wrap
+from textwrap import TextWrapper
+from typing import TYPE_CHECKING
 
-from PIL import Image, ImageDraw, ImageFilter, ImageFont
+# NumPy and Pillow are imported where they are used so that importing this
+# module (e.g. just to check that a backend exists) stays cheap.
+if TYPE_CHECKING:
+    import numpy as np
+    from PIL import Image, ImageFont
 
+_TILE = 40
+_TILE_COLORS = ((0xF7, 0xF0, 0xE8), (0xF0, 0xE8, 0xDD), (0xE9, 0xE0, 0xD5))
+_DOT_COUNT = 180
+_DOT_MAX_RADIUS = 5
+_DOT_COLORS = ((0xD5, 0xC3, 0xB8), (0xC0, 0xB0, 0xA6), (0xE0, 0xD0, 0xC4), (0xB8, 0xC6, 0xD8), (0xD9, 0xBC, 0xD0))
+# The checkerboard repeats every three tiles, so the cached backdrop tile is a
+# multiple of that period to stay seamless.
+_BG_TILE_SIZE = 6 * _TILE
+# Bump when the background or stencil rendering logic changes; together with
+# the parameters it keys the on-disk tile cache so stale tiles are never reused.
+_BG_TILE_VERSION = 1
+_BG_TILE_KEY = hashlib.sha1(
+    repr((_BG_TILE_VERSION, _TILE, _TILE_COLORS, _DOT_COUNT, _DOT_MAX_RADIUS, _DOT_COLORS, _BG_TILE_SIZE)).encode()
+).hexdigest()[:12]
+_BG_TILE_PATH = Path(__file__).with_name(f"imagegen_bg_tile_{_BG_TILE_KEY}.png")
+# Guards the process-wide generator returned by _rng(): NumPy generators are
+# not thread-safe and Streamlit may render several sessions at once.
+_RNG_LOCK = threading.Lock()
 
-def _draw_background(draw: ImageDraw.ImageDraw, width: int, height: int) -> None:
-    """Paint a soft paper-like backdrop with a few pastel dots."""
+# Output directories already created by this process.
+_ENSURED_DIRS: set[str] = set()
+# Filenames combine the process start time and pid with a per-process sequence
+# number, so renders never overwrite each other, even across processes.
+_BOOT = f"{int(time.time())}_{os.getpid()}"
+_COUNTER = itertools.count()
 
-    colors = ["#f7f0e8", "#f0e8dd", "#e9e0d5"]
-    for x in range(0, width, 40):
-        for y in range(0, height, 40):
-            shade = colors[(x + y) % len(colors)]
-            draw.rectangle((x, y, x + 40, y + 40), fill=shade)
 
-    # Sprinkle gentle dots to hint at the wallpaper motif.
-    accent_colors = ["#d5c3b8", "#c0b0a6", "#e0d0c4", "#b8c6d8", "#d9bcd0"]
-    for _ in range(180):
-        radius = randint(2, 5)
-        cx = randint(0, width)
-        cy = randint(0, height)
-        color = accent_colors[randint(0, len(accent_colors) - 1)]
-        draw.ellipse((cx - radius, cy - radius, cx + radius, cy + radius), fill=color)
+@dataclass(frozen=True)
+class _FontPack:
+    """A loaded font together with metrics measured once at load time."""
+
+    font: ImageFont.FreeTypeFont | ImageFont.ImageFont
+    line_h: int
+
+
+@lru_cache(maxsize=8)
+def _font(path: str, size: int) -> _FontPack:
+    """Load a TrueType font once per (path, size), falling back to Pillow's default."""
+
+    from PIL import ImageFont
+
+    try:
+        font = ImageFont.truetype(path, size)
+    except OSError:
+        font = ImageFont.load_default()
+    return _FontPack(font=font, line_h=int(font.getbbox("Ag")[3]))
+
+
+@lru_cache(maxsize=1)
+def _render_title(text: str) -> tuple[Image.Image, int]:
+    """Rasterize ``text`` once into a tight RGBA image plus its top offset."""
+
+    from PIL import Image, ImageDraw
+
+    font = _font("DejaVuSans-Bold.ttf", 30).font
+    left, top, right, bottom = font.getbbox(text)
+    image = Image.new("RGBA", (right - left, bottom - top), (0, 0, 0, 0))
+    ImageDraw.Draw(image).text((-left, -top), text, fill="#4a3a2c", font=font)
+    return image, top
+
+
+@lru_cache(maxsize=1)
+def _rng() -> np.random.Generator:
+    """Return the process-wide generator used for unseeded dot layouts."""
+
+    import numpy as np
+
+    return np.random.default_rng()
+
+
+@lru_cache(maxsize=1)
+def _dot_stencils() -> tuple[np.ndarray, np.ndarray]:
+    """Offsets of a (2R+1)x(2R+1) window and one boolean disk stencil per radius.
+
+    Built once so dot masks are looked up rather than recomputed on every render.
+    """
+
+    import numpy as np
+
+    offsets = np.arange(-_DOT_MAX_RADIUS, _DOT_MAX_RADIUS + 1)
+    stencils = np.add.outer(offsets**2, offsets**2)[None] <= np.arange(_DOT_MAX_RADIUS + 1)[:, None, None] ** 2
+    return offsets, stencils
+
+
+def _render_background(
+    width: int,
+    height: int,
+    rng: np.random.Generator,
+    *,
+    dots: int = _DOT_COUNT,
+    seamless: bool = False,
+) -> Image.Image:
+    """Build a soft paper-like backdrop with a few pastel dots in one pixel buffer.
+
+    With ``seamless`` the dots wrap around the edges so the result tiles cleanly.
+    """
+
+    import numpy as np
+    from PIL import Image
+
+    tile_colors = np.array(_TILE_COLORS, dtype=np.uint8)
+    dot_colors = np.array(_DOT_COLORS, dtype=np.uint8)
+    offsets, stencils = _dot_stencils()
+
+    rows = -(-height // _TILE)
+    cols = -(-width // _TILE)
+    # Tiles alternate along the diagonals, so the whole grid is one outer sum.
+    idx = np.add.outer(np.arange(rows), np.arange(cols)) % len(tile_colors)
+    arr = np.ascontiguousarray(tile_colors[idx].repeat(_TILE, axis=0).repeat(_TILE, axis=1)[:height, :width])
+
+    # Sprinkle gentle dots to hint at the wallpaper motif. Dots are opaque, so
+    # they are stored straight into the RGB buffer: each one is a disk stencil
+    # placed around its centre, all written with a single fancy-indexed store.
+    radii = rng.integers(2, _DOT_MAX_RADIUS + 1, dots)
+    cxs = rng.integers(0, width + 1, dots)
+    cys = rng.integers(0, height + 1, dots)
+    color_idx = rng.integers(0, len(_DOT_COLORS), dots)
+
+    ys, xs, colors = np.broadcast_arrays(
+        cys[:, None, None] + offsets[:, None],
+        cxs[:, None, None] + offsets,
+        color_idx[:, None, None],
+    )
+    inside = stencils[radii]
+    if seamless:
+        ys, xs = ys % height, xs % width
+    else:
+        inside = inside & (ys >= 0) & (ys < height) & (xs >= 0) & (xs < width)
+    arr[ys[inside], xs[inside]] = dot_colors[colors[inside]]
+
+    return Image.fromarray(arr)
+
+
+@lru_cache(maxsize=1)
+def _background_tile() -> Image.Image:
+    """Return the shared seamless backdrop tile, loading it from disk if saved."""
+
+    from PIL import Image
+
+    try:
+        with Image.open(_BG_TILE_PATH) as cached:
+            if cached.size == (_BG_TILE_SIZE, _BG_TILE_SIZE):
+                return cached.convert("RGB")
+    except OSError:
+        pass
+
+    # Keep the dot density of the default 900x1200 canvas.
+    dots = round(_DOT_COUNT * _BG_TILE_SIZE**2 / (900 * 1200))
+    with _RNG_LOCK:
+        tile = _render_background(_BG_TILE_SIZE, _BG_TILE_SIZE, _rng(), dots=dots, seamless=True)
+    # Write to a temp file and rename it into place so concurrent writers
+    # (threads or processes) never expose a partially written tile.
+    try:
+        fd, tmp_name = tempfile.mkstemp(dir=_BG_TILE_PATH.parent, prefix=".imagegen_bg_tile_", suffix=".png")
+    except OSError:
+        return tile  # read-only install; the in-memory tile is still reused
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            tile.save(handle, format="PNG")
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, _BG_TILE_PATH)
+    except OSError:
+        Path(tmp_name).unlink(missing_ok=True)
+    return tile
+
+
+def _tiled_background(width: int, height: int) -> Image.Image:
+    from PIL import Image
+
+    tile = _background_tile()
+    canvas = Image.new("RGB", (width, height))
+    for ty in range(0, height, _BG_TILE_SIZE):
+        for tx in range(0, width, _BG_TILE_SIZE):
+            canvas.paste(tile, (tx, ty))
+    return canvas
+
+
+@lru_cache(maxsize=4)
+def _wrapper(width: int) -> TextWrapper:
+    """Share one ``TextWrapper`` per line width instead of building one per paragraph."""
+
+    return TextWrapper(width=width)
 
 
 def _wrap_text(text: str, chars_per_line: int = 60) -> list[str]:
+    wrapper = _wrapper(chars_per_line)
     lines: list[str] = []
     for block in text.split("\n"):
-        lines.extend(wrap(block.strip(), width=chars_per_line) or [""])
+        lines.extend(wrapper.wrap(block.strip()) or [""])
     return lines
 
 
-def make_image(prompt: str, *, width: int = 900, height: int = 1200, output_dir: str = "generated") -> str:
+def make_image(
+    prompt: str,
+    *,
+    width: int = 900,
+    height: int = 1200,
+    output_dir: str = "generated",
+    seed: int | None = None,
+) -> str:
     """Render a simple wallpaper preview with the prompt text overlay.
 
-    Returns the path to the saved PNG file.
+    The backdrop is tiled from a cached seamless pattern; pass ``seed`` to
+    render a fresh, reproducible dot layout instead. Returns the path to the
+    saved PNG file.
     """
 
-    Path(output_dir).mkdir(parents=True, exist_ok=True)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_path = Path(output_dir) / f"matryoshka_prompt_{timestamp}.png"
+    import numpy as np
+    from PIL import ImageDraw
 
-    canvas = Image.new("RGB", (width, height), "#f6eee2")
-    draw = ImageDraw.Draw(canvas)
+    if output_dir not in _ENSURED_DIRS:
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+        _ENSURED_DIRS.add(output_dir)
+    output_path = Path(output_dir) / f"matryoshka_prompt_{_BOOT}_{next(_COUNTER)}.png"
 
-    _draw_background(draw, width, height)
+    if seed is None:
+        canvas = _tiled_background(width, height)
+    else:
+        canvas = _render_background(width, height, np.random.default_rng(seed))
+    draw = ImageDraw.Draw(canvas)
 
-    try:
-        title_font = ImageFont.truetype("DejaVuSans-Bold.ttf", 30)
-        body_font = ImageFont.truetype("DejaVuSans.ttf", 20)
-    except OSError:
-        title_font = ImageFont.load_default()
-        body_font = ImageFont.load_default()
+    body = _font("DejaVuSans.ttf", 20)
 
-    title = "Matryoshka Prompt"
-    title_w, title_h = draw.textsize(title, font=title_font)
-    draw.text(((width - title_w) / 2, 30), title, fill="#4a3a2c", font=title_font)
+    title, title_top = _render_title("Matryoshka Prompt")
+    canvas.paste(title, ((width - title.width) // 2, 30 + title_top), title)
 
     body_lines = _wrap_text(prompt, chars_per_line=60)
-    y = 100
-    for line in body_lines:
-        draw.text((40, y), line, fill="#3b2f26", font=body_font)
-        y += body_font.getsize(line)[1] + 6
+    draw.multiline_text((40, 100), "\n".join(body_lines), fill="#3b2f26", font=body.font, spacing=6)
 
-    canvas = canvas.filter(ImageFilter.GaussianBlur(radius=0.25))
-    canvas.save(output_path)
+    # Preview files favour fast encoding over size.
+    try:
+        canvas.save(output_path, format="PNG", compress_level=1)
+    except FileNotFoundError:
+        # The directory was removed after we created it; recreate and retry once.
+        _ENSURED_DIRS.discard(output_dir)
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
+        _ENSURED_DIRS.add(output_dir)
+        canvas.save(output_path, format="PNG", compress_level=1)
 
     return str(output_path)
 
@@ -18,6 +18,7 @@ environment or an external API) within the ``generate_image`` function.
 
 import streamlit as st
 
+@st.cache_data(show_spinner=False)
 def build_prompt(
     subject: str,
     face_details: str,
@@ -62,6 +63,11 @@ def build_prompt(
     )
     return prompt
 
+def _clean(*values: str) -> tuple[str, ...]:
+    """Return the form values with surrounding whitespace removed."""
+
+    return tuple(value.strip() for value in values)
+
 def generate_image(prompt: str):
     """Placeholder for image generation logic.
 
@@ -124,12 +130,7 @@ def main() -> None:
 
     if generate:
         prompt = build_prompt(
-            subject.strip(),
-            face_details.strip(),
-            actions.strip(),
-            background_color.strip(),
-            background_elements.strip(),
-            palette.strip(),
+            *_clean(subject, face_details, actions, background_color, background_elements, palette)
         )
         st.subheader("Generated Prompt")
         st.write(prompt)
@@ -11,12 +11,23 @@ recipe plus scene details, and the app can call an ``imagegen`` backend
 if it is available in the environment.
 """
 
-import importlib
-import importlib.util
+from pathlib import Path
 from textwrap import dedent
 
 import streamlit as st
 
+# Resolve the optional generator backend once instead of on every submit.
+# A missing backend means "not configured"; any other import failure is kept
+# and reported when an image is requested, so the prompt builder still works.
+_IMPORT_ERROR = None
+try:
+    import imagegen as _imagegen
+except Exception as error:  # noqa: BLE001 - surfaced to the UI by generate_image
+    _imagegen = None
+    if not (isinstance(error, ModuleNotFoundError) and error.name == "imagegen"):
+        _IMPORT_ERROR = error
+_MAKE_IMAGE = getattr(_imagegen, "make_image", None)
+
 STYLE_RECIPE = dedent(
     """
     Strict style recipe:
@@ -30,7 +41,17 @@ STYLE_RECIPE = dedent(
     """
 )
 
+# Constant prompt segments, assembled once so build_prompt only joins the
+# user-supplied slots in between.
+_PROMPT_HEAD = (
+    "A vertical repeating wallpaper illustration that matches the reference matryoshka images.\n\n"
+    + STYLE_RECIPE
+    + "\n\n"
+)
+_PROMPT_TAIL = "; finish is grainy, soft, and matte."
+
 
+@st.cache_data(show_spinner=False)
 def build_prompt(
     primary_subject: str,
     secondary_subject: str,
@@ -72,33 +93,49 @@ def build_prompt(
             objects_list = ", ".join(cleaned_objects[:-1]) + " and " + cleaned_objects[-1]
         objects_text = f" Each figure holds one of the following props: {objects_list}."
 
-    prompt = (
-        "A vertical repeating wallpaper illustration that matches the reference matryoshka images.\n\n"
-        f"{STYLE_RECIPE}\n\n"
-        f"Scene: repeating, rounded {subjects} {scene_description}. {face_text}{flat_text}{objects_text}\n\n"
-        f"Background: soft {background_color} with scattered, simple {background_elements}; pattern density: {pattern_density}.\n\n"
-        f"Palette: {palette}; texture intensity: {texture_strength}; finish is grainy, soft, and matte."
-    )
-    return prompt
+    parts = [
+        _PROMPT_HEAD,
+        "Scene: repeating, rounded ", subjects, " ", scene_description, ". ",
+        face_text, flat_text, objects_text,
+        "\n\nBackground: soft ", background_color,
+        " with scattered, simple ", background_elements,
+        "; pattern density: ", pattern_density,
+        ".\n\nPalette: ", palette,
+        "; texture intensity: ", texture_strength,
+        _PROMPT_TAIL,
+    ]
+    return "".join(parts)
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _cached_make_image(prompt: str) -> bytes:
+    """Render ``prompt`` once and reuse the PNG bytes for identical prompts.
+
+    The bytes are cached rather than the path so later cleanup or overwrites
+    of the output file cannot leave the cache pointing at a missing image.
+    """
+
+    return Path(_MAKE_IMAGE(prompt=prompt)).read_bytes()
 
 
 def generate_image(prompt: str):
     """Generate an image using the optional ``imagegen`` helper if installed."""
 
-    spec = importlib.util.find_spec("imagegen")
-    if spec is None:
+    if _IMPORT_ERROR is not None:
+        return None, f"Image generation failed: {_IMPORT_ERROR}"
+
+    if _imagegen is None:
         return None, "Image generation not configured: install or provide an `imagegen` module with `make_image()`."
 
-    imagegen = importlib.import_module("imagegen")
-    if not hasattr(imagegen, "make_image"):
+    if _MAKE_IMAGE is None:
         return None, "`imagegen` module found but missing `make_image` function."
 
     try:
-        image_path = imagegen.make_image(prompt=prompt)
+        image = _cached_make_image(prompt)
     except Exception as error:  # noqa: BLE001 - surface generator errors to the UI
         return None, f"Image generation failed: {error}"
 
-    return image_path, None
+    return image, None
 
 
 def main() -> None:
@@ -158,10 +195,10 @@ def main() -> None:
         st.subheader("Generated Prompt")
         st.code(prompt)
 
-        image_path, error = generate_image(prompt)
-        if image_path:
+        image, error = generate_image(prompt)
+        if image:
             st.subheader("Generated Image")
-            st.image(image_path)
+            st.image(image)
         elif error:
             st.info(error)
 